@@ -21,8 +21,8 @@ get_duration() {
     -of default=noprint_wrappers=1:nokey=1 "$1"
 }
 
-# Get audio files (excluding silence), sorted
-mapfile -t audio_files < <(find "$AUDIO_DIR" -type f -name "*.wav" | sort)
+# Get audio files (excluding silence and the synthesis cache), sorted
+mapfile -t audio_files < <(find "$AUDIO_DIR" -maxdepth 1 -type f -name "*.wav" | sort)
 
 # Get silence duration (~0.2s)
 silence_duration=$(get_duration "$SILENCE_FILE")
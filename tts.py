@@ -1,12 +1,19 @@
+import base64
+import datetime
+import hashlib
 import json
 import os
 import sys
 import time
 import requests
-import re # Import regex module for sentence splitting
+from requests.adapters import HTTPAdapter
+import shutil # For copying audio files where hard links aren't supported
 import subprocess # For calling external commands like ffmpeg
+import tempfile # For unique temporary files in the audio cache
 import argparse # For command-line argument parsing
 import textwrap # For wrapping long sentences
+import threading # For refreshing the access token in the background
+from concurrent.futures import ThreadPoolExecutor, as_completed # For synthesizing ahead of the user / in batch
 
 # Import for non-blocking single character input
 try:
@@ -15,8 +22,26 @@ except ImportError:
     import termios # Unix-specific
     import tty # Unix-specific
 
-from google.oauth2 import service_account
-from google.auth.transport.requests import Request
+# Optional faster JSON codec for settings and TTS responses (falls back to the json module)
+try:
+    import orjson # pip install orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8') # Same layout as orjson's OPT_INDENT_2
+
+# Optional in-process audio playback (falls back to spawning ffplay)
+try:
+    import simpleaudio # pip install simpleaudio
+except ImportError:
+    simpleaudio = None
+try:
+    import winsound # Windows-specific
+except ImportError:
+    winsound = None
 
 # --- Configuration and File Paths ---
 CREDENTIALS_FILE = "credentials-tts.json"
@@ -24,27 +49,79 @@ SETTINGS_FILE = "settings.json"
 TEXTS_DIR = "texts"
 AUDIO_DIR = os.path.join(TEXTS_DIR, "audio")
 DATA_FILE = os.path.join(TEXTS_DIR, "data.txt")
+README_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "readme.md") # Shown by --help
+DATA_READ_CHUNK_SIZE = 65536 # Characters read from data.txt at a time
+AUDIO_PATH_FMT = os.path.join(AUDIO_DIR, "{:03d}{}") # 1-based sentence number 0-padded to 3 digits, extension
+CACHE_DIR = os.path.join(AUDIO_DIR, "cache") # Synthesized audio keyed by text + voice settings
+CACHE_MAX_BYTES = 500 * 1024 * 1024 # Oldest cached files are evicted above this total size
+BASE64_DECODE_CHUNK_SIZE = 65536 # Base64 characters decoded at a time, must be a multiple of 4
+
+# --- Sentence Splitting ---
+# Words (lowercase, without the final '.') after which a '.' does not end a sentence
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "vs", "cf", "approx", "fig", "e.g", "i.e",
+})
 
 # --- Google Cloud TTS Voice Settings (Easily Configurable) ---
 TTS_LANGUAGE_CODE = "en-GB"
 TTS_VOICE_NAME = "en-GB-Chirp3-HD-Sadaltager"
 TTS_SPEAKING_RATE = 0.9
-TTS_AUDIO_ENCODING = "LINEAR16" # WAV format (e.g., LINEAR16, MP3, OGG_OPUS)
+TTS_AUDIO_ENCODING = "LINEAR16" # WAV format (e.g., LINEAR16, MP3, OGG_OPUS), see also --encoding
+AUDIO_FILE_EXTENSIONS = {"LINEAR16": ".wav", "MP3": ".mp3", "OGG_OPUS": ".ogg"}
+TTS_REQUEST_TIMEOUT = (3.05, 30) # Seconds: (connect, read)
+TTS_POOL_MAXSIZE = 16 # Pooled connections to the TTS API (raised to --concurrency in batch mode)
+RESPONSE_CHUNK_SIZE = 65536 # Bytes read from the TTS response at a time
+TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5) # Refresh the access token this long before it expires
+TOKEN_REFRESH_RETRY_SECONDS = 60 # Retry delay after a failed background refresh
+POSITION_SAVE_DELAY = 1.0 # Seconds after the last forward move before the position is written
 
 # --- Global Variables ---
 settings = {}
 credentials = None
 project_id = None
 access_token = None
+_token_lock = threading.Lock() # Guards credentials.refresh() and access_token across threads
+_settings_lock = threading.Lock() # Guards position saves between the main thread and the save timer
+_position_timer = None # Pending debounced position save (threading.Timer)
+_pending_position = None # Position waiting to be written by _flush_sentence_position
 _ffmpeg_error_printed = False # Flag to suppress repeated ffmpeg errors
+_session = requests.Session() # Keeps TLS connections to the TTS API alive between sentences
+_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=TTS_POOL_MAXSIZE))
+_prefetch_executor = ThreadPoolExecutor(max_workers=2)
+_prefetch = {} # Sentence index -> Future of audio being synthesized in the background
+_cache_lock = threading.Lock() # Guards _cache_bytes and eviction across synthesis threads
+_cache_bytes = None # Running total size of CACHE_DIR, None until it has been scanned once
+_data_cache = {"mtime": 0, "size": 0, "sentences": None} # Last split of data.txt, reused while the file is unchanged
+_recorded = set() # 0-based indices of sentences that have an audio file in AUDIO_DIR
+_cbreak_settings = None # Original terminal attributes while cbreak mode is held (Unix)
+_ansi_console = True # Whether the console handles ANSI escape codes (see enable_ansi_console)
 
 # --- Helper Functions for User Interaction ---
 
+def enter_cbreak_mode():
+    """Switches the terminal to cbreak mode until restore_terminal is called (Unix only)."""
+    global _cbreak_settings
+    if 'msvcrt' in sys.modules or _cbreak_settings is not None or not sys.stdin.isatty():
+        return
+    fd = sys.stdin.fileno()
+    _cbreak_settings = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+
+def restore_terminal():
+    """Restores the terminal attributes saved by enter_cbreak_mode."""
+    global _cbreak_settings
+    if _cbreak_settings is not None:
+        termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, _cbreak_settings)
+        _cbreak_settings = None
+
 def _getch():
     """Reads a single character from stdin without echoing it or requiring Enter."""
     if 'msvcrt' in sys.modules:
         # Windows
         return msvcrt.getch().decode('utf-8')
+    elif _cbreak_settings is not None:
+        # Terminal is already in cbreak mode for the whole session
+        return sys.stdin.read(1)
     else:
         # Unix/Linux/macOS
         fd = sys.stdin.fileno()
@@ -56,16 +133,41 @@ def _getch():
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
         return ch
 
+def enable_ansi_console():
+    """Turns on ANSI escape code processing on Windows 10+ consoles (already on elsewhere)."""
+    global _ansi_console
+    if os.name != 'nt':
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11) # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        # 0x0004 = ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)) or \
+                not kernel32.SetConsoleMode(handle, mode.value | 0x0004):
+            _ansi_console = False # Older Windows: clear_console falls back to 'cls'
+    except (AttributeError, OSError):
+        _ansi_console = False
+
 def clear_console():
     """Clears the terminal console only if connected to a TTY."""
     if sys.stdout.isatty():
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if _ansi_console:
+            # Home cursor, clear screen and scrollback, without spawning a 'clear' process
+            sys.stdout.write('\x1b[H\x1b[2J\x1b[3J')
+            sys.stdout.flush()
+        else:
+            os.system('cls')
 
 def exit_script(save_position=False, current_index=0):
     """Exits the script gracefully, optionally saving the current position."""
     if save_position:
-        settings["last_processed_sentence"] = current_index
-        save_settings()
+        save_sentence_position(current_index)
+    else:
+        _flush_sentence_position() # Forward moves already made with 'l' are saved even on Ctrl+C
+    # Don't wait for queued prefetches before exiting
+    _prefetch_executor.shutdown(wait=False, cancel_futures=True)
     sys.exit(0)
 
 # --- Core Logic Functions ---
@@ -74,8 +176,8 @@ def load_settings():
     """Loads settings from settings.json or initializes default settings."""
     global settings
     try:
-        with open(SETTINGS_FILE, 'r') as f:
-            settings = json.load(f)
+        with open(SETTINGS_FILE, 'rb') as f:
+            settings = _json_loads(f.read())
         # Ensure the correct key is used, migrate if old key exists
         if "last_processed_paragraph" in settings and "last_processed_sentence" not in settings:
             settings["last_processed_sentence"] = settings.pop("last_processed_paragraph")
@@ -83,7 +185,7 @@ def load_settings():
     except FileNotFoundError:
         settings = {"last_processed_sentence": 0}
         save_settings()
-    except json.JSONDecodeError:
+    except json.JSONDecodeError: # Also raised by orjson
         settings = {"last_processed_sentence": 0}
         save_settings()
     except IOError as e:
@@ -93,12 +195,45 @@ def load_settings():
 
 def save_settings():
     """Saves current settings to settings.json."""
+    # Write a temporary file and swap it in, so an interrupted write can't leave a truncated settings.json
+    tmp_file = SETTINGS_FILE + ".tmp"
     try:
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=4)
+        with open(tmp_file, 'wb') as f:
+            f.write(_json_dumps(settings))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, SETTINGS_FILE)
     except IOError as e:
         print(f"Error saving settings to {SETTINGS_FILE}: {e}")
 
+def _flush_sentence_position():
+    """Writes the pending position, skipping the disk write if it is already saved."""
+    global _pending_position
+    with _settings_lock:
+        if _pending_position is not None and settings.get("last_processed_sentence") != _pending_position:
+            settings["last_processed_sentence"] = _pending_position
+            save_settings()
+        _pending_position = None
+
+def save_sentence_position(current_index, debounce=False):
+    """
+    Saves the last processed sentence.
+    With debounce, the write happens POSITION_SAVE_DELAY seconds after the last call instead,
+    so holding 'l' writes settings.json once rather than on every key press.
+    """
+    global _pending_position, _position_timer
+    with _settings_lock:
+        _pending_position = current_index
+        if _position_timer is not None:
+            _position_timer.cancel()
+            _position_timer = None
+        if debounce:
+            _position_timer = threading.Timer(POSITION_SAVE_DELAY, _flush_sentence_position)
+            _position_timer.daemon = True # exit_script flushes the pending position itself
+            _position_timer.start()
+            return
+    _flush_sentence_position()
+
 def get_credentials():
     """
     Attempts to load Google Cloud TTS credentials from credentials-tts.json.
@@ -109,6 +244,9 @@ def get_credentials():
 
     if os.path.exists(CREDENTIALS_FILE):
         try:
+            # Imported here: google-auth pulls in heavy crypto modules that --help doesn't need
+            from google.oauth2 import service_account
+            from google.auth.transport.requests import Request
             credentials = service_account.Credentials.from_service_account_file(
                 CREDENTIALS_FILE,
                 scopes=['https://www.googleapis.com/auth/cloud-platform']
@@ -127,66 +265,176 @@ def get_credentials():
     else:
         print(f"'{CREDENTIALS_FILE}' not found.")
         print("To use Google Cloud Text-to-Speech API, you need a service account key file.")
-        print("Please follow the setup instructions in the README.md section within this script's comments.")
+        print("Please follow the setup instructions in readme.md (or run this script with --help).")
         print(f"Place '{CREDENTIALS_FILE}' in the current directory and restart the script.")
         return False
 
 
+def _is_initial_before(buf, i, at_end):
+    """
+    Tells whether the '.' at buf[i], right after a lone capital letter, belongs to an initial
+    or abbreviation (J. R. Smith, U.S. law) rather than ending a sentence (Vitamin C. Then).
+    It does if the next word starts lowercase or is another initial.
+    Returns None if buf doesn't reach far enough to decide yet.
+    """
+    j = i + 1
+    while j < len(buf) and buf[j].isspace():
+        j += 1
+    if j + 1 >= len(buf) and not at_end:
+        return None
+    next_word = buf[j:j + 2]
+    return next_word[:1].islower() or (len(next_word) == 2 and next_word[0].isupper() and next_word[1] == '.')
+
+def _split_sentences(chunks):
+    """
+    Splits text into sentences in a single linear pass, keeping the delimiter.
+    The text is given as an iterable of string chunks, so it never has to be in memory at once.
+    A sentence ends at . ! ? followed by whitespace or end of text, but a '.' after a word
+    in ABBREVIATIONS (Mr., e.g.) or an initial (U.S., J. Smith, see _is_initial_before) is skipped.
+    Yields stripped, non-empty sentences.
+    """
+    buf = ""
+    scan_from = 0 # Everything in buf before this index is known not to end a sentence
+    chunks = iter(chunks)
+    at_end = False
+    while not at_end:
+        chunk = next(chunks, None)
+        if chunk is None:
+            at_end = True
+        else:
+            buf += chunk
+        start = 0
+        i = scan_from
+        while i < len(buf):
+            ch = buf[i]
+            if ch not in '.!?':
+                i += 1
+                continue
+            if i + 1 == len(buf) and not at_end:
+                break # Whether it ends a sentence depends on what follows, wait for the next chunk
+            if i + 1 < len(buf) and not buf[i + 1].isspace():
+                i += 1
+                continue # Not followed by whitespace (e.g. 3.14, "...")
+            if ch == '.' and i > 0:
+                prev = buf[i - 1]
+                if prev.isupper() and prev != 'I' and (i == 1 or not buf[i - 2].isalpha()):
+                    is_initial = _is_initial_before(buf, i, at_end)
+                    if is_initial is None:
+                        break # Need the next chunk to see the following word
+                    if is_initial:
+                        i += 1
+                        continue
+                else:
+                    word_start = i
+                    while word_start > start and not buf[word_start - 1].isspace():
+                        word_start -= 1
+                    if buf[word_start:i].lstrip('("\'[').lower() in ABBREVIATIONS:
+                        i += 1
+                        continue # Abbreviation guard: Mr. Smith / e.g. this
+            sentence = buf[start:i + 1].strip()
+            if sentence:
+                yield sentence
+            start = i + 1
+            i += 1
+        buf = buf[start:]
+        scan_from = i - start
+    sentence = buf.strip() # End of text ends the last sentence
+    if sentence:
+        yield sentence
+
 def read_sentences():
-    """Reads data.txt and splits it into sentences."""
+    """Reads data.txt and splits it into sentences (reusing the last result if the file is unchanged)."""
     if not os.path.exists(DATA_FILE):
         print(f"Error: '{DATA_FILE}' not found.")
         print(f"Please create a '{TEXTS_DIR}' folder and put your text in '{DATA_FILE}'.")
         exit_script()
 
     try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Remove Byte Order Mark (BOM) if present, common with some UTF-8 files
-        if content.startswith('\ufeff'):
-            content = content.lstrip('\ufeff')
-
-        # Regex to split sentences, keeping the delimiter.
-        # This one handles common cases and tries to avoid splitting on abbreviations.
-        # It looks for . ! ? followed by whitespace or end of string,
-        # but not preceded by a capital letter (for abbreviations like Mr. or U.S.).
-        sentences = re.findall(r'(?<![A-Z]\.)[^.!?]+(?:[.!?](?=\s|$))?', content)
-        # Further clean up and strip whitespace
-        sentences = [s.strip() for s in sentences if s.strip()]
+        stat = os.stat(DATA_FILE)
+        if _data_cache["sentences"] is not None and \
+                (stat.st_mtime_ns, stat.st_size) == (_data_cache["mtime"], _data_cache["size"]):
+            return _data_cache["sentences"]
+
+        # 'utf-8-sig' removes the Byte Order Mark (BOM) if present, common with some UTF-8 files
+        with open(DATA_FILE, 'r', encoding='utf-8-sig') as f:
+            # Stream the file in chunks through a linear scanner instead of reading it whole
+            # and running a regex over it, so long or unusual input can't cause backtracking.
+            sentences = list(_split_sentences(iter(lambda: f.read(DATA_READ_CHUNK_SIZE), '')))
 
         if not sentences:
             print(f"Warning: '{DATA_FILE}' is empty or contains no discernible sentences.")
             exit_script()
+        _data_cache.update(mtime=stat.st_mtime_ns, size=stat.st_size, sentences=sentences)
         return sentences
     except Exception as e:
         print(f"Error reading '{DATA_FILE}': {e}")
         exit_script()
 
-def synthesize_text(text, sentence_number):
+def refresh_access_token():
+    """Refreshes the access token of the loaded credentials (thread-safe) and returns it."""
+    global access_token
+    from google.auth.transport.requests import Request
+    with _token_lock:
+        credentials.refresh(Request())
+        access_token = credentials.token
+        return access_token
+
+def schedule_token_refresh(delay=None):
+    """
+    Starts a background timer that refreshes the access token shortly before it expires
+    and then reschedules itself, so long sessions never hit a 401 mid-synthesis.
+    Args:
+        delay (float): Seconds until the refresh; by default derived from the token expiry.
+    """
+    if delay is None:
+        if credentials is None or credentials.expiry is None:
+            return
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) # expiry is naive UTC
+        delay = max((credentials.expiry - TOKEN_REFRESH_MARGIN - now).total_seconds(), 0)
+    timer = threading.Timer(delay, _background_token_refresh)
+    timer.daemon = True # Don't keep the script alive on exit
+    timer.start()
+
+def _background_token_refresh():
+    """Timer callback for schedule_token_refresh."""
+    try:
+        refresh_access_token()
+    except Exception:
+        # Try again later; synthesize_text still refreshes on a 401 in the meantime
+        schedule_token_refresh(TOKEN_REFRESH_RETRY_SECONDS)
+        return
+    schedule_token_refresh()
+
+def synthesize_text(text, sentence_number, quiet=False):
     """
     Sends a sentence to Google Cloud TTS API and returns the audio content.
     Args:
         text (str): The text to synthesize.
         sentence_number (int): The current sentence number for logging.
+        quiet (bool): Don't print errors (background prefetch, which would draw over the screen).
     Returns:
-        bytes: The audio content in WAV format, or None if an error occurs.
+        str: The base64-encoded audio content in TTS_AUDIO_ENCODING format, or None if an error occurs.
     """
-    global access_token, project_id # Allow modification if token is refreshed
+    report = (lambda *args: None) if quiet else print
 
     if not access_token or not project_id:
+        if quiet:
+            return None # Leave reloading credentials (and its messages) to the foreground
         # Try to refresh credentials if they are missing during an active session
         if get_credentials():
             pass # Credentials reloaded successfully
         else:
-            print("Failed to re-obtain valid credentials. Cannot synthesize.")
+            report("Failed to re-obtain valid credentials. Cannot synthesize.")
             return None
 
+    with _token_lock: # Don't read the token halfway through a background refresh
+        token = access_token
+
     api_url = f"https://texttospeech.googleapis.com/v1/text:synthesize"
     headers = {
         "Content-Type": "application/json",
         "X-Goog-User-Project": project_id,
-        "Authorization": f"Bearer {access_token}"
+        "Authorization": f"Bearer {token}"
     }
 
     payload = {
@@ -205,68 +453,267 @@ def synthesize_text(text, sentence_number):
     }
 
     try:
-        response = requests.post(api_url, headers=headers, json=payload)
-        response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-
-        audio_content = response.json().get("audioContent")
+        # Stream the (large, base64-encoded) body in big chunks into one buffer that is parsed
+        # as is, instead of letting requests join many small chunks into response.content
+        with _session.post(api_url, headers=headers, json=payload, timeout=TTS_REQUEST_TIMEOUT, stream=True) as response:
+            response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
+            body = bytearray()
+            for chunk in response.iter_content(RESPONSE_CHUNK_SIZE):
+                body += chunk
+
+        audio_content = _json_loads(body).get("audioContent")
         if audio_content:
-            import base64
-            return base64.b64decode(audio_content)
+            return audio_content # Decoded by _write_base64 straight into the file
         else:
-            print(f"Synthesis Error: No audio content received for sentence {sentence_number}.")
+            report(f"Synthesis Error: No audio content received for sentence {sentence_number}.")
             return None
     except requests.exceptions.HTTPError as http_err:
-        print(f"Synthesis HTTP error: {http_err.response.status_code}") # Short info
+        report(f"Synthesis HTTP error: {http_err.response.status_code}") # Short info
         if http_err.response.status_code == 403:
-            print("Synthesis Error: Permission denied. Check TTS role.")
+            report("Synthesis Error: Permission denied. Check TTS role.")
         elif http_err.response.status_code == 401:
-            print("Synthesis Error: Unauthorized. Attempting token refresh...")
-            credentials.refresh(Request())
-            access_token = credentials.token
-            print("Token refreshed. Try recording again.")
+            report("Synthesis Error: Unauthorized. Attempting token refresh...")
+            refresh_access_token()
+            report("Token refreshed. Try recording again.")
         return None
     except requests.exceptions.ConnectionError as conn_err:
-        print(f"Synthesis Error: Connection error: {conn_err}")
+        report(f"Synthesis Error: Connection error: {conn_err}")
         return None
     except requests.exceptions.Timeout as timeout_err:
-        print(f"Synthesis Error: Timeout: {timeout_err}")
+        report(f"Synthesis Error: Timeout: {timeout_err}")
         return None
     except requests.exceptions.RequestException as req_err:
-        print(f"Synthesis Error: Unexpected request error: {req_err}")
+        report(f"Synthesis Error: Unexpected request error: {req_err}")
         return None
     except json.JSONDecodeError:
-        print(f"Synthesis Error: JSON decode error in response.")
+        report(f"Synthesis Error: JSON decode error in response.")
         return None
     except Exception as e:
-        print(f"Synthesis Error: Unexpected error: {e}")
+        report(f"Synthesis Error: Unexpected error: {e}")
+        return None
+
+def _cache_key(text):
+    """Returns a SHA-256 hex digest of the text and every voice setting that affects the audio."""
+    key = f"{text}|{TTS_LANGUAGE_CODE}|{TTS_VOICE_NAME}|{TTS_SPEAKING_RATE}|{TTS_AUDIO_ENCODING}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def _scan_cache():
+    """Returns (mtime, size, path) for every finished cache file, skipping in-flight .tmp files."""
+    entries = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith(".tmp"):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue # Replaced or evicted by another thread in the meantime
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+def _evict_cache():
+    """Deletes the least recently used cache files until the cache is under CACHE_MAX_BYTES."""
+    global _cache_bytes
+    try:
+        entries = sorted(_scan_cache()) # Oldest first
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_size <= CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+        _cache_bytes = total_size
+    except OSError as e:
+        print(f"Error evicting audio cache in {CACHE_DIR}: {e}")
+
+def _account_cache_write(size):
+    """Adds a newly cached file to the running cache size, evicting only once it exceeds CACHE_MAX_BYTES."""
+    global _cache_bytes
+    with _cache_lock:
+        if _cache_bytes is None:
+            _evict_cache() # First write this session: scan once (the new file is included)
+        else:
+            _cache_bytes += size
+            if _cache_bytes > CACHE_MAX_BYTES:
+                _evict_cache()
+
+def _cache_path(text):
+    """Returns the cache file path for the given text under the current voice settings."""
+    return os.path.join(CACHE_DIR, _cache_key(text) + AUDIO_FILE_EXTENSIONS[TTS_AUDIO_ENCODING])
+
+def _write_base64(filepath, audio_base64):
+    """Decodes base64 audio into a file chunk by chunk, never holding the whole decoded audio in memory."""
+    with open(filepath, 'wb') as f:
+        for start in range(0, len(audio_base64), BASE64_DECODE_CHUNK_SIZE):
+            f.write(base64.b64decode(audio_base64[start:start + BASE64_DECODE_CHUNK_SIZE]))
+
+def synthesize_cached(text, sentence_number, force=False, quiet=False):
+    """
+    Returns the cached audio file for a sentence, synthesizing and caching it on a miss.
+    Args:
+        text (str): The text to synthesize.
+        sentence_number (int): The current sentence number for logging.
+        force (bool): Skip the cache lookup and replace the cached entry with a new take (re-recording).
+        quiet (bool): Don't print errors (see synthesize_text).
+    Returns:
+        str: The path to the cached audio file, or None if an error occurs.
+    """
+    cache_path = _cache_path(text)
+    if not force and os.path.exists(cache_path):
+        try:
+            os.utime(cache_path) # Mark as recently used for eviction
+            return cache_path
+        except OSError:
+            pass # Evicted in the meantime, synthesize again
+
+    audio_base64 = synthesize_text(text, sentence_number, quiet)
+    if not audio_base64:
+        return None
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Unique temp name: other threads may be caching the same text at the same time
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        _write_base64(tmp_path, audio_base64)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, cache_path) # Never leave a truncated file under the final name
+    except (IOError, ValueError) as e: # ValueError: malformed base64
+        if not quiet:
+            print(f"Error caching audio to {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return None
+    _account_cache_write(size)
+    return cache_path
 
-def save_audio(audio_content, sentence_index):
+def prefetch_audio(sentences, sentence_index):
+    """
+    Starts synthesizing a sentence in a background thread, so that recording it
+    later only has to wait for whatever is left of the request (or nothing at all).
+    """
+    # Only the sentence the user is on is worth paying for: cancel queued prefetches of sentences
+    # passed by (e.g. holding 'l'). Finished ones are already in the disk cache.
+    for index in [index for index in _prefetch if index != sentence_index]:
+        future = _prefetch[index]
+        if future.done() or future.cancel():
+            del _prefetch[index]
+    text = sentences[sentence_index]
+    if sentence_index in _prefetch or sentence_index in _recorded or os.path.exists(_cache_path(text)):
+        return # Already underway, or a re-record which bypasses the cache anyway
+    _prefetch[sentence_index] = _prefetch_executor.submit(synthesize_cached, text, sentence_index + 1, quiet=True)
+
+def cancel_prefetch():
+    """Cancels all queued prefetches; ones already running finish into the disk cache."""
+    for future in _prefetch.values():
+        future.cancel()
+    _prefetch.clear()
+
+def load_recorded():
+    """Scans AUDIO_DIR once to find which sentences already have an audio file in the current encoding."""
+    global _recorded
+    _recorded = set()
+    extension = AUDIO_FILE_EXTENSIONS[TTS_AUDIO_ENCODING]
+    if os.path.isdir(AUDIO_DIR):
+        for name in os.listdir(AUDIO_DIR):
+            stem, ext = os.path.splitext(name)
+            if ext == extension and stem.isdigit():
+                _recorded.add(int(stem) - 1)
+
+def save_audio(cache_path, sentence_index):
     """
-    Saves the audio content to a WAV file.
+    Saves a cached audio file as the sentence's file (WAV, OGG or MP3 depending on TTS_AUDIO_ENCODING).
+    The file is hard-linked where possible, so the audio is neither read nor written again.
     Args:
-        audio_content (bytes): The binary audio data.
+        cache_path (str): The path to the cached audio file, as returned by synthesize_cached.
         sentence_index (int): The 0-based index of the sentence.
     Returns:
         str: The path to the saved file, or None if saving fails.
     """
     os.makedirs(AUDIO_DIR, exist_ok=True)
-    filename = f"{sentence_index + 1:03d}.wav" # 0-padded to 3 digits, 1-based number
-    filepath = os.path.join(AUDIO_DIR, filename)
+    filepath = AUDIO_PATH_FMT.format(sentence_index + 1, AUDIO_FILE_EXTENSIONS[TTS_AUDIO_ENCODING])
+    tmp_path = filepath + ".tmp"
     try:
-        with open(filepath, 'wb') as f:
-            f.write(audio_content)
+        if os.path.exists(filepath) and os.path.samefile(cache_path, filepath):
+            _recorded.add(sentence_index) # Already linked to this exact audio
+            return filepath
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            os.link(cache_path, tmp_path)
+        except OSError:
+            shutil.copyfile(cache_path, tmp_path) # Filesystem without hard links
+        # Replace rather than overwrite: writing into a hard-linked file would change the cached copy too
+        os.replace(tmp_path, filepath)
+        _recorded.add(sentence_index)
         return filepath
-    except IOError as e:
+    except (IOError, OSError) as e:
         print(f"Error saving audio to {filepath}: {e}")
         return None
 
+def batch_synthesize(sentences, concurrency):
+    """
+    Non-interactively synthesizes and saves every sentence that has no audio file yet.
+    Up to `concurrency` requests are in flight at once, which also keeps the request
+    rate within reasonable bounds for the API quota.
+    """
+    # Sentences repeated in the text ("Yes.") share one cache entry, so synthesize each text once
+    pending = {} # Text -> 0-based indices of the unrecorded sentences with that text
+    for index, text in enumerate(sentences):
+        if index not in _recorded:
+            pending.setdefault(text, []).append(index)
+    total_sentences = len(sentences)
+    total_pending = sum(len(indices) for indices in pending.values())
+    print(f"{total_pending} of {total_sentences} sentences need audio ({len(pending)} unique).")
+    saved = failed = 0
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    futures = {executor.submit(synthesize_cached, text, indices[0] + 1): indices for text, indices in pending.items()}
+    try:
+        for future in as_completed(futures):
+            try:
+                cache_path = future.result()
+            except Exception as e: # E.g. cache directory not writable, token refresh failed
+                print(f"Synthesis Error: Unexpected error: {e}")
+                cache_path = None
+            for index in futures[future]:
+                if cache_path and save_audio(cache_path, index):
+                    saved += 1
+                    print(f"Saved sentence {index + 1} / {total_sentences}")
+                else:
+                    failed += 1
+                    print(f"Failed sentence {index + 1} / {total_sentences}")
+    except KeyboardInterrupt:
+        # Don't send the rest of the queue to the (paid) API; only requests already in flight finish
+        executor.shutdown(wait=False, cancel_futures=True)
+        print(f"\nBatch interrupted: {saved} saved, {failed} failed, {total_pending - saved - failed} skipped.")
+        return
+    executor.shutdown()
+    print(f"Batch complete: {saved} saved, {failed} failed.")
+
+def _play_in_process(filepath):
+    """Plays a WAV file with simpleaudio or winsound."""
+    if simpleaudio:
+        simpleaudio.WaveObject.from_wave_file(filepath).play().wait_done()
+    else:
+        winsound.PlaySound(filepath, winsound.SND_FILENAME)
+
 def play_audio(filepath):
     """
-    Plays an audio file using ffplay (part of FFmpeg).
+    Plays an audio file in-process (simpleaudio, or winsound on Windows) when available,
+    otherwise using ffplay (part of FFmpeg).
     Suppresses repeated errors.
     """
     global _ffmpeg_error_printed
+    if (simpleaudio or winsound) and filepath.endswith('.wav'): # Neither decodes OGG/MP3
+        try:
+            _play_in_process(filepath)
+            return
+        except Exception:
+            pass # Fall back to ffplay, which reports its own errors
+
     player_command = ["ffplay"] # Default for Linux/macOS
     if sys.platform == "win32":
         player_command = ["ffplay.exe"] # For Windows
@@ -334,128 +781,32 @@ def print_interactive_help():
 
 
 def print_readme():
-    """Prints the content of the README.md from the script's docstring."""
-    readme_content = """
-# Google Cloud TTS Sentence Processor (Interactive CLI)
-
-This Python script helps you convert text sentences from a file into audio WAV files using Google Cloud Text-to-Speech API. It provides an interactive command-line interface for navigating, processing, and re-recording sentences.
-
-## Features:
-- Reads text from `texts/data.txt` and splits it into individual sentences.
-- Uses Google Cloud Text-to-Speech API for synthesis.
-- Saves generated audio files as `001.wav`, `002.wav`, etc., in `texts/audio/`.
-- Remembers the last processed sentence's position using `settings.json` when quitting with 'q'.
-- Interactive, non-blocking key presses for navigation and actions.
-- Displays the full current sentence on the console, clearing previous output.
-- Marks recorded sentences with an asterisk (`*`).
-- Plays recorded audio using `ffplay` (part of FFmpeg).
-- TTS voice settings are easily configurable at the top of the script.
-
-## Interactive Key Bindings:
--   **`J` (or `j`):** Move to the previous sentence (if available).
--   **`L` (or `l`):** Move to the next sentence (if available). Saves current position when moving to the next.
--   **Spacebar (` `):** Record (synthesize) the current sentence. If already recorded, it will re-record and play the audio.
--   **`P` (or `p`):** Play recorded audio of current sentence (if available).
--   **`R` (or `r`):** Reload `data.txt`. The cursor (current sentence position) will remain at its current index if possible, otherwise it will adjust to the new range.
--   **`Q` (or `q`):** Quit the script and save the last processed sentence's position.
--   **`H` (or `h`):** Show this help message.
--   **`Ctrl+C`:** Quit the script *without* saving the last processed sentence's position.
-
-## Setup:
-
-1.  **Python Environment:**
-    Make sure you have Python 3 installed.
-    Install the necessary libraries:
-    ```bash
-    pip install google-auth google-auth-oauthlib requests
-    ```
-    Depending on your OS, you might need to ensure `msvcrt` (Windows) / `termios`, `tty` (Unix-like) are available for non-blocking input. These are standard library modules.
-
-2.  **FFmpeg Installation:**
-    Ensure FFmpeg is installed on your system and `ffplay` (or `ffplay.exe` on Windows) is accessible via your system's PATH.
-    -   **Linux (Debian/Ubuntu):** `sudo apt update && sudo apt install ffmpeg`
-    -   **Linux (Fedora):** `sudo dnf install ffmpeg`
-    -   **Windows:** Download a pre-built binary from the official FFmpeg website and add its `bin` directory to your System PATH.
-
-3.  **Google Cloud Project & Credentials:**
-    You need a Google Cloud Project with the Text-to-Speech API enabled and a Service Account key file.
-    Follow these steps to obtain your `credentials-tts.json` file:
-
-    a.  **Go to Google Cloud Console:**
-        Open your web browser and go to `https://console.cloud.google.com/`.
-
-    b.  **Select or Create a Project:**
-        Choose an existing project or create a new one.
-
-    c.  **Enable Text-to-Speech API:**
-        Navigate to `APIs & Services` > `Enabled APIs & Services`.
-        Click `+ ENABLE APIS AND SERVICES`.
-        Search for "Cloud Text-to-Speech API" and enable it.
-
-    d.  **Create a Service Account:**
-        Navigate to `IAM & Admin` > `Service Accounts`.
-        Click `+ CREATE SERVICE ACCOUNT`.
-        Give it a name (e.g., `tts-service-account`).
-        Click `DONE`.
-
-    e.  **Grant Permissions:**
-        In the list of service accounts, find the one you just created and click on its email address.
-        Go to the `Permissions` tab.
-        Click `GRANT ACCESS`.
-        In the `New principals` field, add the service account you just created.
-        In the `Select a role` dropdown, search for and select `Cloud Text-to-Speech User`.
-        Click `SAVE`.
-        **Important:** If you encounter `INVALID_ARGUMENT` errors during role assignment via CLI, you might need to grant a broader role like `Editor` temporarily, and then narrow it down manually in the console after successful API usage.
-
-    f.  **Create a JSON Key:**
-        Go back to the `Service Accounts` page (`IAM & Admin` > `Service Accounts`).
-        Click on the email address of your service account.
-        Go to the `Keys` tab.
-        Click `ADD KEY` > `Create new key`.
-        Select `JSON` as the key type and click `CREATE`.
-        A JSON file will be downloaded to your computer.
-
-    g.  **Rename and Place the Key File:**
-        Rename the downloaded JSON file to `credentials-tts.json`.
-        Place this `credentials-tts.json` file in the same directory as your Python script.
-
-4.  **Text Data:**
-    Create a folder named `texts` in the same directory as your script.
-    Inside the `texts` folder, create a file named `data.txt`.
-    Paste the text you want to convert into `data.txt`. The script will now split the content into individual sentences.
-
-5.  **Audio Output Folder:**
-    The script will automatically create a folder named `audio` inside the `texts` folder (`texts/audio/`) to store the generated WAV files.
-
-## Usage:
-
-1.  **Run the script:**
-    ```bash
-    python your_script_name.py
-    ```
-    (Replace `your_script_name.py` with the actual name of your Python file).
-
-2.  **Interact using keys:**
-    Use `j` and `l` to navigate, `Spacebar` to record/play, `R` to reload text, and `Q` to quit.
-
-## Important Notes:
-
--   **Sentence Definition:** The script attempts to split text into sentences based on common punctuation (`.`, `!`, `?`), trying to handle some abbreviations. Complex sentence structures or unusual text might not be perfectly split. Review `data.txt` content if sentences are not as expected.
--   **Voice Configuration:** The default voice settings are at the top of the script (`TTS_LANGUAGE_CODE`, `TTS_VOICE_NAME`, `TTS_SPEAKING_RATE`, `TTS_AUDIO_ENCODING`).
--   **Error Handling:** The script includes basic error handling for file operations and API calls. API token refresh attempts are made automatically if an unauthorized error occurs. FFmpeg errors are suppressed after the first occurrence in a session.
--   **Console Environment:** Ensure your terminal supports ANSI escape codes for clearing the screen (most modern terminals do).
-"""
-    print(readme_content)
+    """Prints readme.md from the script's directory, or a short usage note if it is missing."""
+    try:
+        with open(README_FILE, 'r', encoding='utf-8') as f:
+            sys.stdout.write(f.read())
+    except IOError:
+        print("# Google Cloud TTS Sentence Processor (Interactive CLI)")
+        print(f"\nUsage: python {os.path.basename(sys.argv[0])} [--batch [--concurrency N]] [--encoding LINEAR16|MP3|OGG_OPUS]")
+        print(f"Full documentation is in readme.md, which was not found at '{README_FILE}'.")
+        print_interactive_help()
 
 
 def main():
     """Main function to run the TTS processing script with interactive CLI."""
-    global _ffmpeg_error_printed # Declare global for assignment within main
+    global _ffmpeg_error_printed, TTS_AUDIO_ENCODING # Declare global for assignment within main
+
+    enable_ansi_console()
 
     # 1. Handle command-line arguments
     parser = argparse.ArgumentParser(add_help=False) # add_help=False to handle it manually
     parser.add_argument('--help', action='store_true', help='Show this help message and exit.')
+    parser.add_argument('--batch', action='store_true', help='Synthesize all unrecorded sentences without the interactive mode.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of parallel TTS requests in batch mode.')
+    parser.add_argument('--encoding', choices=sorted(AUDIO_FILE_EXTENSIONS), default=TTS_AUDIO_ENCODING,
+                        help='Audio encoding requested from the API. OGG_OPUS/MP3 download much less data than LINEAR16.')
     args = parser.parse_args()
+    TTS_AUDIO_ENCODING = args.encoding
 
     if args.help:
         clear_console() # Clear before printing full README
@@ -471,6 +822,7 @@ def main():
     # Get Google Cloud TTS credentials (will prompt for setup if missing, then exit)
     if not get_credentials():
         sys.exit(0) # Exit if credentials are not available
+    schedule_token_refresh() # Keep the token fresh in the background from now on
 
     sentences = []
     current_sentence_index = settings.get("last_processed_sentence", 0)
@@ -478,6 +830,7 @@ def main():
     # Initial load of sentences
     try:
         sentences = read_sentences()
+        load_recorded()
         # Adjust index if it's out of bounds after initial load (e.g., data.txt shrank)
         if current_sentence_index >= len(sentences):
             current_sentence_index = len(sentences) - 1 if len(sentences) > 0 else 0
@@ -486,6 +839,12 @@ def main():
     except SystemExit: # read_sentences might call exit_script
         sys.exit(0) # Propagate the exit
 
+    if args.batch:
+        concurrency = max(1, args.concurrency)
+        if concurrency > TTS_POOL_MAXSIZE: # Otherwise extra connections would be discarded, not reused
+            _session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=concurrency))
+        batch_synthesize(sentences, concurrency)
+        sys.exit(0)
 
     # Print initial sentence number and simple instruction
     total_sentences = len(sentences)
@@ -495,218 +854,118 @@ def main():
     time.sleep(1) # Give user a moment to read initial message
 
     # Main interactive loop
-    while True:
-        # Re-calculate sentence_audio_exists for the *current* current_sentence_index
-        # This ensures its state is always accurate before display.
-        sentence_audio_exists = os.path.exists(os.path.join(AUDIO_DIR, f"{current_sentence_index + 1:03d}.wav"))
+    enter_cbreak_mode() # Once for the whole session instead of on every key press
+    try:
+        while True:
+            # Re-calculate sentence_audio_exists for the *current* current_sentence_index
+            # This ensures its state is always accurate before display.
+            sentence_audio_exists = current_sentence_index in _recorded
 
-        try:
-            if not sentences:
-                clear_console()
-                print("No sentences found in data.txt. Please add text and press 'R' to reload.")
-                key = _getch().lower() # Read and convert to lowercase for case-insensitivity
-                if key == 'q':
-                    exit_script(save_position=True, current_index=current_sentence_index) # Save on 'q'
-                elif key == 'r':
-                    _ffmpeg_error_printed = False # Reset ffmpeg error flag on reload
-                    sentences = read_sentences()
-                    # Preserve cursor position logic already handled after read_sentences
-                    if current_sentence_index >= len(sentences):
-                        current_sentence_index = len(sentences) - 1 if len(sentences) > 0 else 0
-                    # After reload, print sentence number to indicate new state (as requested)
-                    if len(sentences) > 0:
-                        clear_console() # Clear to show the new count
-                        print(f"Sentence {current_sentence_index + 1} / {len(sentences)}")
+            try:
+                if not sentences:
+                    clear_console()
+                    print("No sentences found in data.txt. Please add text and press 'R' to reload.")
+                    key = _getch().lower() # Read and convert to lowercase for case-insensitivity
+                    if key == 'q':
+                        exit_script(save_position=True, current_index=current_sentence_index) # Save on 'q'
+                    elif key == 'r':
+                        _ffmpeg_error_printed = False # Reset ffmpeg error flag on reload
+                        sentences = read_sentences()
+                        load_recorded()
+                        # Preserve cursor position logic already handled after read_sentences
+                        if current_sentence_index >= len(sentences):
+                            current_sentence_index = len(sentences) - 1 if len(sentences) > 0 else 0
+                        # After reload, print sentence number to indicate new state (as requested)
+                        if len(sentences) > 0:
+                            clear_console() # Clear to show the new count
+                            print(f"Sentence {current_sentence_index + 1} / {len(sentences)}")
                     
-                continue # Restart loop to display
+                    continue # Restart loop to display
             
-            # The display_sentence function itself handles clearing the console
-            # and printing the sentence and asterisk.
-            display_sentence(sentences, current_sentence_index, sentence_audio_exists)
-
-            key = _getch().lower() # Read single key press and convert to lowercase
-
-            if key == 'l': # Next sentence
-                if current_sentence_index < len(sentences) - 1:
-                    current_sentence_index += 1
-                    # Save position only when moving forward to the next sentence
-                    settings["last_processed_sentence"] = current_sentence_index
-                    save_settings()
-                else:
-                    pass # Do nothing if at the end
-            elif key == 'j': # Previous sentence
-                if current_sentence_index > 0:
-                    current_sentence_index -= 1
-            elif key == ' ': # Spacebar: record/re-record and play
-                audio_data = synthesize_text(sentences[current_sentence_index], current_sentence_index + 1)
-                if audio_data:
-                    filepath = save_audio(audio_data, current_sentence_index)
-                    if filepath:
-                        play_audio(filepath) # Play the newly recorded audio
-            elif key == 'p': # Play recorded audio
-                filepath = os.path.join(AUDIO_DIR, f"{current_sentence_index + 1:03d}.wav")
-                if os.path.exists(filepath):
-                    play_audio(filepath)
-                else:
-                    clear_console()
-                    print(f"No recorded audio found for sentence {current_sentence_index + 1}.")
-                    print("\nPress any key to continue...")
-                    _getch() # Wait for user to acknowledge
-            elif key == 'r': # Reload text file
-                _ffmpeg_error_printed = False # Reset ffmpeg error flag on reload
-                old_index = current_sentence_index
-                try:
-                    sentences = read_sentences()
-                    new_total_sentences = len(sentences)
-                    # Keep cursor position, but adjust if new total is smaller or 0
-                    if old_index < new_total_sentences:
-                        current_sentence_index = old_index
-                    elif new_total_sentences > 0:
-                        current_sentence_index = new_total_sentences - 1
+                # The display_sentence function itself handles clearing the console
+                # and printing the sentence and asterisk.
+                display_sentence(sentences, current_sentence_index, sentence_audio_exists)
+
+                key = _getch().lower() # Read single key press and convert to lowercase
+
+                if key == 'l': # Next sentence
+                    if current_sentence_index < len(sentences) - 1:
+                        current_sentence_index += 1
+                        # Save position only when moving forward to the next sentence
+                        save_sentence_position(current_sentence_index, debounce=True)
+                        prefetch_audio(sentences, current_sentence_index)
+                    else:
+                        pass # Do nothing if at the end
+                elif key == 'j': # Previous sentence
+                    if current_sentence_index > 0:
+                        current_sentence_index -= 1
+                elif key == ' ': # Spacebar: record/re-record and play
+                    future = _prefetch.pop(current_sentence_index, None)
+                    re_record = current_sentence_index in _recorded
+                    cache_path = future.result() if future and not re_record else None
+                    if not cache_path: # Not prefetched, the prefetch failed, or a new take is wanted
+                        cache_path = synthesize_cached(sentences[current_sentence_index], current_sentence_index + 1,
+                                                       force=re_record)
+                    if cache_path:
+                        filepath = save_audio(cache_path, current_sentence_index)
+                        if filepath:
+                            play_audio(filepath) # Play the newly recorded audio
+                elif key == 'p': # Play recorded audio
+                    filepath = AUDIO_PATH_FMT.format(current_sentence_index + 1, AUDIO_FILE_EXTENSIONS[TTS_AUDIO_ENCODING])
+                    if os.path.exists(filepath):
+                        play_audio(filepath)
                     else:
-                        current_sentence_index = 0 # No sentences after reload
+                        clear_console()
+                        print(f"No recorded audio found for sentence {current_sentence_index + 1}.")
+                        print("\nPress any key to continue...")
+                        _getch() # Wait for user to acknowledge
+                elif key == 'r': # Reload text file
+                    _ffmpeg_error_printed = False # Reset ffmpeg error flag on reload
+                    old_index = current_sentence_index
+                    try:
+                        sentences = read_sentences()
+                        load_recorded()
+                        cancel_prefetch() # Indices may point to different text now
+                        new_total_sentences = len(sentences)
+                        # Keep cursor position, but adjust if new total is smaller or 0
+                        if old_index < new_total_sentences:
+                            current_sentence_index = old_index
+                        elif new_total_sentences > 0:
+                            current_sentence_index = new_total_sentences - 1
+                        else:
+                            current_sentence_index = 0 # No sentences after reload
                     
-                    # After reload, print sentence number to indicate new state (as requested)
-                    if len(sentences) > 0:
-                        clear_console() # Clear to show the new count
-                        print(f"Sentence {current_sentence_index + 1} / {len(sentences)}")
+                        # After reload, print sentence number to indicate new state (as requested)
+                        if len(sentences) > 0:
+                            clear_console() # Clear to show the new count
+                            print(f"Sentence {current_sentence_index + 1} / {len(sentences)}")
                     
-                except SystemExit:
-                    sys.exit(0) # Propagate exit if read_sentences fails critically
-            elif key == 'q': # Quit
-                exit_script(save_position=True, current_index=current_sentence_index) # Save on 'q'
-            elif key == 'h': # Show help
-                clear_console()
-                print_interactive_help()
-                # Wait for user to acknowledge, then clear and redraw current sentence
-                print("\nPress any key to continue...")
-                _getch()
-                clear_console() # Clear after help
-                # The loop will naturally call display_sentence next
-
-        except KeyboardInterrupt:
-            # Handle Ctrl+C gracefully without saving position as requested
-            exit_script(save_position=False)
-        except Exception as e:
-            clear_console() # Clear to show error clearly
-            print(f"An unexpected error occurred in the main loop: {e}")
-            print("Press 'q' to quit or any other key to continue (may lead to further errors).")
-            key = _getch().lower()
-            if key == 'q':
-                exit_script(save_position=True, current_index=current_sentence_index) # Save on 'q'
-
-
-# --- README.md (Multi-line comment) ---
-"""
-# Google Cloud TTS Sentence Processor (Interactive CLI)
-
-This Python script helps you convert text sentences from a file into audio WAV files using Google Cloud Text-to-Speech API. It provides an interactive command-line interface for navigating, processing, and re-recording sentences.
-
-## Features:
-- Reads text from `texts/data.txt` and splits it into individual sentences.
-- Uses Google Cloud Text-to-Speech API for synthesis.
-- Saves generated audio files as `001.wav`, `002.wav`, etc., in `texts/audio/`.
-- Remembers the last processed sentence's position using `settings.json` when quitting with 'q'.
-- Interactive, non-blocking key presses for navigation and actions.
-- Displays the full current sentence on the console, clearing previous output.
-- Marks recorded sentences with an asterisk (`*`).
-- Plays recorded audio using `ffplay` (part of FFmpeg).
-- TTS voice settings are easily configurable at the top of the script.
-
-## Interactive Key Bindings:
--   **`J` (or `j`):** Move to the previous sentence (if available).
--   **`L` (or `l`):** Move to the next sentence (if available). Saves current position when moving to the next.
--   **Spacebar (` `):** Record (synthesize) the current sentence. If already recorded, it will re-record and play the audio.
--   **`P` (or `p`):** Play recorded audio of current sentence (if available).
--   **`R` (or `r`):** Reload `data.txt`. The cursor (current sentence position) will remain at its current index if possible, otherwise it will adjust to the new range.
--   **`Q` (or `q`):** Quit the script and save the last processed sentence's position.
--   **`H` (or `h`):** Show this help message.
--   **`Ctrl+C`:** Quit the script *without* saving the last processed sentence's position.
-
-## Setup:
-
-1.  **Python Environment:**
-    Make sure you have Python 3 installed.
-    Install the necessary libraries:
-    ```bash
-    pip install google-auth google-auth-oauthlib requests
-    ```
-    Depending on your OS, you might need to ensure `msvcrt` (Windows) / `termios`, `tty` (Unix-like) are available for non-blocking input. These are standard library modules.
-
-2.  **FFmpeg Installation:**
-    Ensure FFmpeg is installed on your system and `ffplay` (or `ffplay.exe` on Windows) is accessible via your system's PATH.
-    -   **Linux (Debian/Ubuntu):** `sudo apt update && sudo apt install ffmpeg`
-    -   **Linux (Fedora):** `sudo dnf install ffmpeg`
-    -   **Windows:** Download a pre-built binary from the official FFmpeg website and add its `bin` directory to your System PATH.
-
-3.  **Google Cloud Project & Credentials:**
-    You need a Google Cloud Project with the Text-to-Speech API enabled and a Service Account key file.
-    Follow these steps to obtain your `credentials-tts.json` file:
-
-    a.  **Go to Google Cloud Console:**
-        Open your web browser and go to `https://console.cloud.google.com/`.
-
-    b.  **Select or Create a Project:**
-        Choose an existing project or create a new one.
-
-    c.  **Enable Text-to-Speech API:**
-        Navigate to `APIs & Services` > `Enabled APIs & Services`.
-        Click `+ ENABLE APIS AND SERVICES`.
-        Search for "Cloud Text-to-Speech API" and enable it.
-
-    d.  **Create a Service Account:**
-        Navigate to `IAM & Admin` > `Service Accounts`.
-        Click `+ CREATE SERVICE ACCOUNT`.
-        Give it a name (e.g., `tts-service-account`).
-        Click `DONE`.
-
-    e.  **Grant Permissions:**
-        In the list of service accounts, find the one you just created and click on its email address.
-        Go to the `Permissions` tab.
-        Click `GRANT ACCESS`.
-        In the `New principals` field, add the service account you just created.
-        In the `Select a role` dropdown, search for and select `Cloud Text-to-Speech User`.
-        Click `SAVE`.
-        **Important:** If you encounter `INVALID_ARGUMENT` errors during role assignment via CLI, you might need to grant a broader role like `Editor` temporarily, and then narrow it down manually in the console after successful API usage.
-
-    f.  **Create a JSON Key:**
-        Go back to the `Service Accounts` page (`IAM & Admin` > `Service Accounts`).
-        Click on the email address of your service account.
-        Go to the `Keys` tab.
-        Click `ADD KEY` > `Create new key`.
-        Select `JSON` as the key type and click `CREATE`.
-        A JSON file will be downloaded to your computer.
-
-    g.  **Rename and Place the Key File:**
-        Rename the downloaded JSON file to `credentials-tts.json`.
-        Place this `credentials-tts.json` file in the same directory as your Python script.
-
-4.  **Text Data:**
-    Create a folder named `texts` in the same directory as your script.
-    Inside the `texts` folder, create a file named `data.txt`.
-    Paste the text you want to convert into `data.txt`. The script will now split the content into individual sentences.
-
-5.  **Audio Output Folder:**
-    The script will automatically create a folder named `audio` inside the `texts` folder (`texts/audio/`) to store the generated WAV files.
-
-## Usage:
-
-1.  **Run the script:**
-    ```bash
-    python your_script_name.py
-    ```
-    (Replace `your_script_name.py` with the actual name of your Python file).
-
-2.  **Interact using keys:**
-    Use `j` and `l` to navigate, `Spacebar` to record/play, `R` to reload text, and `Q` to quit.
-
-## Important Notes:
-
--   **Sentence Definition:** The script attempts to split text into sentences based on common punctuation (`.`, `!`, `?`), trying to handle some abbreviations. Complex sentence structures or unusual text might not be perfectly split. Review `data.txt` content if sentences are not as expected.
--   **Voice Configuration:** The default voice settings are at the top of the script (`TTS_LANGUAGE_CODE`, `TTS_VOICE_NAME`, `TTS_SPEAKING_RATE`, `TTS_AUDIO_ENCODING`).
--   **Error Handling:** The script includes basic error handling for file operations and API calls. API token refresh attempts are made automatically if an unauthorized error occurs. FFmpeg errors are suppressed after the first occurrence in a session.
--   **Console Environment:** Ensure your terminal supports ANSI escape codes for clearing the screen (most modern terminals do).
-"""
+                    except SystemExit:
+                        sys.exit(0) # Propagate exit if read_sentences fails critically
+                elif key == 'q': # Quit
+                    exit_script(save_position=True, current_index=current_sentence_index) # Save on 'q'
+                elif key == 'h': # Show help
+                    clear_console()
+                    print_interactive_help()
+                    # Wait for user to acknowledge, then clear and redraw current sentence
+                    print("\nPress any key to continue...")
+                    _getch()
+                    clear_console() # Clear after help
+                    # The loop will naturally call display_sentence next
+
+            except KeyboardInterrupt:
+                # Handle Ctrl+C gracefully without saving position as requested
+                exit_script(save_position=False)
+            except Exception as e:
+                clear_console() # Clear to show error clearly
+                print(f"An unexpected error occurred in the main loop: {e}")
+                print("Press 'q' to quit or any other key to continue (may lead to further errors).")
+                key = _getch().lower()
+                if key == 'q':
+                    exit_script(save_position=True, current_index=current_sentence_index) # Save on 'q'
+    finally:
+        restore_terminal() # Also runs on exit_script / Ctrl+C, which raise SystemExit
+
 
 if __name__ == "__main__":
     main()